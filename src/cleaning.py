@@ -8,6 +8,51 @@ from .scoring import add_question_scores, add_summary_scores
 ROOT = Path(__file__).resolve().parents[1]
 RAW_PATH = ROOT / "data" / "raw" / "Psychology Study Results.xlsx"
 PROCESSED_PATH = ROOT / "data" / "processed" / "study_results_clean.csv"
+# Typed, columnar copy of the same data; faster to reload than the CSV
+PARQUET_PATH = PROCESSED_PATH.with_suffix(".parquet")
+# make_processed(keep_per_question=True) writes here instead, so the default
+# files above always have the same columns
+PER_QUESTION_PATH = PROCESSED_PATH.with_name("study_results_clean_per_question.csv")
+
+# Google Forms export format, for Timestamp cells stored as text
+# (proper date cells already come back from the reader as datetimes)
+TIMESTAMP_FORMAT = "%m/%d/%Y %H:%M:%S"
+
+
+def _column_kind(name: str):
+    """
+    Classify a raw sheet column: "timestamp", "name", "score" (the
+    per-question [Score] column), "conf" (confidence rating), or None
+    for everything tidy_columns doesn't need.
+    """
+    if name == "Timestamp":
+        return "timestamp"
+    if name.endswith("[Score]"):
+        return "score"
+    if name.startswith("How confident"):
+        return "conf"
+    if "What is your name" in name:
+        return "name"
+    return None
+
+
+def _is_used_column(name: str) -> bool:
+    """True for the columns tidy_columns actually needs."""
+    return _column_kind(name) is not None
+
+
+def _parse_timestamps(raw: pd.Series) -> pd.Series:
+    """
+    Parse Timestamp cells, trying TIMESTAMP_FORMAT first (fast C path).
+    Text in any other layout falls back to per-element inference, so only
+    cells that aren't dates at all (summary labels, numbers, blanks) become NaT.
+    """
+    ts = pd.to_datetime(raw, format=TIMESTAMP_FORMAT, errors="coerce")
+    retry = ts.isna() & raw.map(lambda v: isinstance(v, str))
+    if retry.any():
+        parsed = pd.to_datetime(raw[retry], format="mixed", errors="coerce")
+        ts[retry] = parsed.astype(ts.dtype)
+    return ts
 
 
 def load_and_combine() -> pd.DataFrame:
@@ -15,19 +60,43 @@ def load_and_combine() -> pd.DataFrame:
         "CG": "Psychology Study - CG",
         "EG": "Psychology Study - EG",
     }
+    # One read_excel call for both sheets, so the workbook is opened once;
+    # calamine is a Rust xlsx reader, much faster than the default openpyxl.
+    # Every cell is still decoded; usecols only keeps question text,
+    # probability, weighted score etc. out of the returned frames.
+    sheets = pd.read_excel(
+        RAW_PATH,
+        sheet_name=list(SHEET_MAP.values()),
+        engine="calamine",
+        usecols=_is_used_column,
+    )
+
     frames = []
     for group_code, sheet_name in SHEET_MAP.items():
-        df_sheet = pd.read_excel(RAW_PATH, sheet_name=sheet_name)
+        df_sheet = sheets[sheet_name]
 
-        # Keep only real participant rows: Timestamp must be a valid datetime
+        # Keep only real participant rows: Timestamp must be a valid datetime.
         if "Timestamp" in df_sheet.columns:
-            mask = pd.to_datetime(df_sheet["Timestamp"], errors="coerce").notna()
-            df_sheet = df_sheet[mask]
+            df_sheet["Timestamp"] = _parse_timestamps(df_sheet["Timestamp"])
+            df_sheet = df_sheet[df_sheet["Timestamp"].notna()].copy()  # avoids chained-assignment warnings
+
+        # Junk rows are gone, so scores / confidences can be typed once here.
+        # Stray text in a participant row becomes NaN rather than an error;
+        # float32 is what the scoring code works in, so no later casts are needed.
+        kinds = {c: _column_kind(c) for c in df_sheet.columns}
+        num_cols = [c for c, kind in kinds.items() if kind in ("score", "conf")]
+        df_sheet[num_cols] = (
+            df_sheet[num_cols].apply(pd.to_numeric, errors="coerce").astype("float32")
+        )
+        name_cols = [c for c, kind in kinds.items() if kind == "name"]
+        df_sheet = df_sheet.astype({c: "string" for c in name_cols})
 
         df_sheet["group"] = group_code
         frames.append(df_sheet)
 
     df = pd.concat(frames, ignore_index=True)
+    # Two fixed labels: store as categorical codes rather than Python strings
+    df["group"] = df["group"].astype(pd.CategoricalDtype(categories=list(SHEET_MAP)))
     return df
 
 
@@ -38,13 +107,14 @@ def tidy_columns(df: pd.DataFrame, n_questions: int = 20) -> pd.DataFrame:
     Also keep a participant name column for easy reference.
     """
 
-    # ---- identify score + confidence columns ----
-    score_cols = [c for c in df.columns if c.endswith("[Score]")]
-    conf_cols = [c for c in df.columns if c.startswith("How confident")]
-
-    cols = list(df.columns)
-    score_cols = sorted(score_cols, key=lambda c: cols.index(c))
-    conf_cols = sorted(conf_cols, key=lambda c: cols.index(c))
+    # ---- identify score + confidence + name columns in one pass ----
+    # Walking df.columns in order keeps each list in sheet order, so no sort is needed
+    by_kind = {"score": [], "conf": [], "name": []}
+    for c in df.columns:
+        kind = _column_kind(c)
+        if kind in by_kind:
+            by_kind[kind].append(c)
+    score_cols, conf_cols, name_candidates = by_kind["score"], by_kind["conf"], by_kind["name"]
 
     if len(score_cols) != n_questions:
         print(f"⚠ WARNING: Expected {n_questions} score columns but found {len(score_cols)}")
@@ -53,11 +123,10 @@ def tidy_columns(df: pd.DataFrame, n_questions: int = 20) -> pd.DataFrame:
 
     # Drop non-participant / junk rows based on the first score column
     first_score_col = score_cols[0]
-    mask = pd.to_numeric(df[first_score_col], errors="coerce").notna()
+    mask = df[first_score_col].notna()
     df = df[mask].copy()  # copy() avoids chained-assignment warnings
 
     # ---- participant name column ----
-    name_candidates = [c for c in df.columns if "What is your name" in c]
     if name_candidates:
         participant = df[name_candidates[0]]
     else:
@@ -66,17 +135,15 @@ def tidy_columns(df: pd.DataFrame, n_questions: int = 20) -> pd.DataFrame:
         else:
             participant = pd.Series(range(1, len(df) + 1), index=df.index)
 
-    # ---- build a fresh, compact DataFrame from a dict ----
-    data = {
-        "participant": participant,
-        "group": df["group"],
-    }
-
-    for i, (sc, cc) in enumerate(zip(score_cols, conf_cols), start=1):
-        data[f"correct_{i}"] = pd.to_numeric(df[sc], errors="coerce")
-        data[f"conf_{i}"] = pd.to_numeric(df[cc], errors="coerce")
+    # ---- build a fresh, compact DataFrame in one concat ----
+    n = min(len(score_cols), len(conf_cols))
+    correct = df[score_cols[:n]].set_axis([f"correct_{i}" for i in range(1, n + 1)], axis=1)
+    conf = df[conf_cols[:n]].set_axis([f"conf_{i}" for i in range(1, n + 1)], axis=1)
 
-    clean_df = pd.DataFrame(data)
+    clean_df = pd.concat(
+        [participant.rename("participant"), df["group"], correct, conf],
+        axis=1,
+    )
 
     # Reorder columns nicely (just in case)
     cols_order = (
@@ -89,25 +156,67 @@ def tidy_columns(df: pd.DataFrame, n_questions: int = 20) -> pd.DataFrame:
     return clean_df
 
 
-def make_processed(n_questions: int = 20) -> pd.DataFrame:
+def _output_paths(keep_per_question: bool):
+    """(csv, parquet) paths for the default or per-question output."""
+    csv_path = PER_QUESTION_PATH if keep_per_question else PROCESSED_PATH
+    return csv_path, csv_path.with_suffix(".parquet")
+
+
+def _load_cached(n_questions: int, parquet_path: Path):
+    """
+    Return the processed Parquet file if it is newer than both the raw
+    workbook and the pipeline code in src/, and was built with the same
+    n_questions, else None.
+    """
+    if not parquet_path.exists():
+        return None
+    inputs = [RAW_PATH, *Path(__file__).parent.glob("*.py")]
+    if max(p.stat().st_mtime for p in inputs) > parquet_path.stat().st_mtime:
+        return None
+
+    cached = pd.read_parquet(parquet_path)
+    if sum(c.startswith("correct_") for c in cached.columns) != n_questions:
+        return None
+    return cached
+
+
+def make_processed(
+    n_questions: int = 20,
+    keep_per_question: bool = False,
+    use_cache: bool = True,
+) -> pd.DataFrame:
     """
     Full pipeline:
       - load CG/EG sheets
       - tidy column names
-      - compute per-question p, ABS, CWS
+      - compute per-question p, ABS, CWS (only if keep_per_question)
       - compute participant-level totals for accuracy, ABS, CWS
-      - save to data/processed/study_results_clean.csv
+      - save to data/processed/study_results_clean.csv (+ .parquet), or
+        study_results_clean_per_question.csv (+ .parquet) if keep_per_question
+
+    If the processed data is already up to date with the raw workbook and
+    the code in src/ (and use_cache is True), it is loaded instead of
+    re-parsing Excel.
     """
+    csv_path, parquet_path = _output_paths(keep_per_question)
+    if use_cache:
+        cached = _load_cached(n_questions, parquet_path)
+        if cached is not None:
+            print(f"Loaded cached data from {parquet_path}")
+            return cached
+
     df = load_and_combine()
     df = tidy_columns(df, n_questions=n_questions)
 
-    # Compute all 3 scoring systems
-    df = add_question_scores(df, n_questions, use_abs=True, use_cws=True)
+    # Compute all 3 scoring systems; totals don't need the per-question columns
+    if keep_per_question:
+        df = add_question_scores(df, n_questions, use_abs=True, use_cws=True)
     df = add_summary_scores(df, n_questions, use_abs=True, use_cws=True)
 
-    PROCESSED_PATH.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(PROCESSED_PATH, index=False)
-    print(f"Saved cleaned data to {PROCESSED_PATH}")
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(csv_path, index=False)
+    df.to_parquet(parquet_path, index=False, compression="zstd")
+    print(f"Saved cleaned data to {csv_path} and {parquet_path.name}")
 
     return df
 
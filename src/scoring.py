@@ -1,7 +1,15 @@
 # src/scoring.py
+import numpy as np
 import pandas as pd
 
 
+# Below this many elements numexpr's setup cost outweighs the saved temporaries
+NUMEXPR_MIN_SIZE = 100_000
+# Below this many participants, importing Numba and compiling the kernel
+# costs more than it saves; the NumPy path is used instead
+NUMBA_MIN_ROWS = 100_000
+
+
 def confidence_to_prob(conf_series: pd.Series) -> pd.Series:
     """
     Map confidence 1–7 to probability 0–1.
@@ -10,6 +18,54 @@ def confidence_to_prob(conf_series: pd.Series) -> pd.Series:
     return (conf_series - 1) / 6
 
 
+def _use_numexpr(p, y) -> bool:
+    """
+    numexpr only for large inputs with plain NumPy dtypes; nullable /
+    extension dtypes and scalars keep the pandas arithmetic.
+    """
+    return np.size(p) >= NUMEXPR_MIN_SIZE and all(
+        isinstance(getattr(v, "dtype", None), np.dtype) for v in (p, y)
+    )
+
+
+def _evaluate(expr: str, p, y):
+    """
+    Evaluate an elementwise expression of p and y in a single numexpr
+    pass. Returns a Series (on p's index) if p is a Series, else an array.
+    Two Series are aligned on p's index first, as pandas arithmetic would.
+
+    Agrees with the plain path (check with ``python -m doctest src/scoring.py``):
+
+    >>> n = NUMEXPR_MIN_SIZE
+    >>> p, y = np.zeros(n, dtype=int), np.ones(n, dtype=int)
+    >>> abs_for_question(p, y)[:2], ((1 - (p - y) ** 2) + 0.5 * y)[:2]
+    (array([0.5, 0.5]), array([0.5, 0.5]))
+    >>> p32, y32 = np.full(n, 0.5, np.float32), np.ones(n, np.float32)
+    >>> out = cws_for_question(p32, y32)
+    >>> out.dtype, bool(np.allclose(out, y32 * (0.6 + 0.4 * p32)))
+    (dtype('float32'), True)
+    >>> ps, ys = pd.Series(np.linspace(0, 1, n)), pd.Series(np.ones(n))[::-1]
+    >>> plain = (1 - (ps - ys) ** 2) + 0.5 * ys
+    >>> bool(np.allclose(abs_for_question(ps, ys), plain.reindex(ps.index)))
+    True
+    >>> abs_for_question(ps.astype("Float64"), ys.astype("Float64")).dtype
+    Float64Dtype()
+    """
+    import numexpr as ne  # only needed for large inputs
+
+    if isinstance(p, pd.Series) and isinstance(y, pd.Series):
+        y = y.reindex(p.index)
+    p_arr, y_arr = np.asarray(p), np.asarray(y)
+    out = ne.evaluate(expr, local_dict={"p": p_arr, "y": y_arr})
+    # numexpr promotes float32 inputs to float64 through its float constants;
+    # narrow back only then, so other inputs keep the plain path's float64
+    if p_arr.dtype == np.float32 and y_arr.dtype == np.float32:
+        out = out.astype(np.float32)
+    if isinstance(p, pd.Series):
+        return pd.Series(out, index=p.index)
+    return out
+
+
 # ---------- ABS (Augmented Brier Score) ---------- #
 
 def abs_for_question(p: pd.Series, y: pd.Series) -> pd.Series:
@@ -20,6 +76,8 @@ def abs_for_question(p: pd.Series, y: pd.Series) -> pd.Series:
     y: correctness (0 or 1)
     ABS = (1 - (p - y)^2) + 0.5y
     """
+    if _use_numexpr(p, y):
+        return _evaluate("(1 - (p - y) ** 2) + 0.5 * y", p, y)
     return (1 - (p - y) ** 2) + 0.5 * y
 
 
@@ -36,6 +94,8 @@ def cws_for_question(p: pd.Series, y: pd.Series) -> pd.Series:
       confident correct > guessed correct > unconfident wrong > confident wrong
       and all correct > all wrong.
     """
+    if _use_numexpr(p, y):
+        return _evaluate("y * (0.6 + 0.4 * p) + (1 - y) * (0.4 - 0.4 * p)", p, y)
     correct_part = 0.6 + 0.4 * p
     wrong_part = 0.4 - 0.4 * p
     return y * correct_part + (1 - y) * wrong_part
@@ -43,6 +103,106 @@ def cws_for_question(p: pd.Series, y: pd.Series) -> pd.Series:
 
 # ---------- Attach per-question scores to dataframe ---------- #
 
+def _score_inputs(df: pd.DataFrame, n_questions: int):
+    """
+    Return (C, Y) as (participants x questions) float32 arrays:
+    confidence from conf_i and 0/1 correctness from correct_i.
+
+    Inputs are small integers, so float32 is plenty for the per-question
+    scores; totals are accumulated in float64 by the callers.
+    """
+    qs = range(1, n_questions + 1)
+    C = df[[f"conf_{i}" for i in qs]].to_numpy(dtype=np.float32)
+    Y = df[[f"correct_{i}" for i in qs]].to_numpy(dtype=np.float32)
+    return C, Y
+
+
+def _score_loop(C, Y):
+    """
+    Plain-loop body of score_kernel, compiled with Numba on first use.
+    """
+    n, q = C.shape
+    total_correct = np.empty(n)
+    mean_conf = np.empty(n)
+    total_abs = np.empty(n)
+    total_cws = np.empty(n)
+    for i in range(n):
+        k = 0.0
+        conf_sum = 0.0
+        n_conf = 0
+        a = 0.0
+        c = 0.0
+        for j in range(q):
+            conf = C[i, j]
+            y = Y[i, j]
+            if not np.isnan(y):
+                k += y
+            if not np.isnan(conf):
+                conf_sum += conf
+                n_conf += 1
+            if np.isnan(conf) or np.isnan(y):
+                continue
+            p = (conf - 1.0) / 6.0
+            a += 1.0 - (p - y) * (p - y) + 0.5 * y
+            c += y * (0.6 + 0.4 * p) + (1.0 - y) * (0.4 - 0.4 * p)
+        total_correct[i] = k
+        mean_conf[i] = conf_sum / n_conf if n_conf > 0 else np.nan
+        total_abs[i] = a
+        total_cws[i] = c
+    return total_correct, mean_conf, total_abs, total_cws
+
+
+_jit_score_loop = None
+
+
+def _score_numpy(C, Y):
+    """
+    NumPy version of score_kernel for small inputs. NaN answers are
+    skipped, like pandas' sum / mean with skipna=True. Works in float64,
+    as the compiled loop does, so totals don't depend on which path ran.
+    """
+    C = C.astype(np.float64)
+    Y = Y.astype(np.float64)
+    P = confidence_to_prob(C)
+    answered = ~(np.isnan(C) | np.isnan(Y))
+    n_conf = (~np.isnan(C)).sum(axis=1)
+    with np.errstate(invalid="ignore"):
+        mean_conf = np.nansum(C, axis=1, dtype=np.float64) / n_conf
+    return (
+        np.nansum(Y, axis=1, dtype=np.float64),
+        mean_conf,
+        np.where(answered, abs_for_question(P, Y), 0).sum(axis=1, dtype=np.float64),
+        np.where(answered, cws_for_question(P, Y), 0).sum(axis=1, dtype=np.float64),
+    )
+
+
+def score_kernel(C, Y):
+    """
+    All participant-level totals from the confidence (C) and
+    correctness (Y) matrices:
+
+      (total_correct, mean_conf, total_abs, total_cws)
+
+    Same formulas as abs_for_question / cws_for_question. Inputs with at
+    least NUMBA_MIN_ROWS participants run a Numba-compiled single pass with
+    no per-question temporaries; smaller ones use NumPy, which avoids the
+    import and JIT cost.
+    """
+    global _jit_score_loop
+    if C.shape[0] < NUMBA_MIN_ROWS:
+        return _score_numpy(C, Y)
+
+    if _jit_score_loop is None:
+        from numba import njit
+
+        # Every fastmath flag except "nnan"/"ninf": missing answers are NaN
+        # and must still be skipped, like pandas' sum(skipna=True) does.
+        _jit_score_loop = njit(
+            fastmath={"nsz", "arcp", "contract", "afn", "reassoc"}, cache=True
+        )(_score_loop)
+    return _jit_score_loop(C, Y)
+
+
 def add_question_scores(
     df: pd.DataFrame,
     n_questions: int = 20,
@@ -59,20 +219,30 @@ def add_question_scores(
     Expects columns:
       conf_i   – confidence 1–7
       correct_i– 0/1 correctness
-    """
-    for i in range(1, n_questions + 1):
-        conf_col = f"conf_{i}"
-        y_col = f"correct_{i}"
-        p_col = f"p_{i}"
 
-        df[p_col] = confidence_to_prob(df[conf_col])
+    Returns a new DataFrame; df itself is not modified, so use the
+    return value. Existing p_i / abs_i / cws_i columns are replaced.
+    """
+    # The scoring functions are plain arithmetic, so they broadcast
+    # over the whole (participants x questions) block at once.
+    C, Y = _score_inputs(df, n_questions)
+    P = confidence_to_prob(C)
+    ABS = abs_for_question(P, Y) if use_abs else None
+    CWS = cws_for_question(P, Y) if use_cws else None
 
+    # Collect the new columns and attach them with a single concat,
+    # rather than inserting them into df one at a time
+    new = {}
+    for j, i in enumerate(range(1, n_questions + 1)):
+        new[f"p_{i}"] = P[:, j]
         if use_abs:
-            df[f"abs_{i}"] = abs_for_question(df[p_col], df[y_col])
+            new[f"abs_{i}"] = ABS[:, j]
         if use_cws:
-            df[f"cws_{i}"] = cws_for_question(df[p_col], df[y_col])
+            new[f"cws_{i}"] = CWS[:, j]
 
-    return df
+    # Replace any p_i / abs_i / cws_i already present instead of duplicating them
+    df = df.drop(columns=list(new), errors="ignore")
+    return pd.concat([df, pd.DataFrame(new, index=df.index, copy=False)], axis=1)
 
 
 # ---------- Participant-level summaries ---------- #
@@ -91,20 +261,22 @@ def add_summary_scores(
       mean_conf
       total_abs  – sum of ABS_i  (if use_abs)
       total_cws  – sum of CWS_i  (if use_cws)
-    """
-    correct_cols = [f"correct_{i}" for i in range(1, n_questions + 1)]
-    conf_cols = [f"conf_{i}" for i in range(1, n_questions + 1)]
 
-    df["total_correct"] = df[correct_cols].sum(axis=1)
-    df["accuracy"] = df["total_correct"] / n_questions
-    df["mean_conf"] = df[conf_cols].mean(axis=1)
+    Everything is computed in one score_kernel pass straight from
+    conf_i / correct_i, so the per-question abs_i / cws_i columns do
+    not need to exist.
+    """
+    total_correct, mean_conf, total_abs, total_cws = score_kernel(
+        *_score_inputs(df, n_questions)
+    )
 
+    df["total_correct"] = total_correct
+    df["accuracy"] = total_correct / n_questions
+    df["mean_conf"] = mean_conf
     if use_abs:
-        abs_cols = [f"abs_{i}" for i in range(1, n_questions + 1)]
-        df["total_abs"] = df[abs_cols].sum(axis=1)
-
+        df["total_abs"] = total_abs
     if use_cws:
-        cws_cols = [f"cws_{i}" for i in range(1, n_questions + 1)]
-        df["total_cws"] = df[cws_cols].sum(axis=1)
+        df["total_cws"] = total_cws
+
+    return df
 
-    return df
\ No newline at end of file
@@ -8,20 +8,11 @@ def group_descriptives(df: pd.DataFrame, dv: str, group_col: str = "group") -> p
     """
     Simple descriptives (n, mean, sd, se) for CG vs EG on a given DV.
     """
-    rows = []
-    for grp, sub in df.groupby(group_col):
-        x = sub[dv].dropna()
-        n = x.shape[0]
-        rows.append(
-            {
-                "group": grp,
-                "n": n,
-                "mean": x.mean(),
-                "sd": x.std(ddof=1),
-                "se": x.std(ddof=1) / np.sqrt(n) if n > 0 else np.nan,
-            }
-        )
-    return pd.DataFrame(rows)
+    g = df.groupby(group_col, observed=True)[dv].agg(["count", "mean", "std"])
+    g["se"] = g["std"] / np.sqrt(g["count"])
+    g = g.rename(columns={"count": "n", "std": "sd"})
+    g.index.name = "group"
+    return g.reset_index()
 
 
 def independent_t(df: pd.DataFrame, dv: str,
@@ -31,26 +22,29 @@ def independent_t(df: pd.DataFrame, dv: str,
     Welch's t-test for dv between two groups.
     Returns a dict with t, p, means, and Cohen's d.
     """
-    x1 = df.loc[df[group_col] == g1, dv].dropna()
-    x2 = df.loc[df[group_col] == g2, dv].dropna()
+    x1 = df.loc[df[group_col] == g1, dv].dropna().to_numpy(dtype=np.float64)
+    x2 = df.loc[df[group_col] == g2, dv].dropna().to_numpy(dtype=np.float64)
 
     t, p = stats.ttest_ind(x1, x2, equal_var=False)
 
-    # Cohen's d (pooled SD)
-    n1, n2 = len(x1), len(x2)
+    # Per-group statistics, computed once and reused below
+    n1, n2 = x1.size, x2.size
+    m1, m2 = x1.mean(), x2.mean()
     s1, s2 = x1.std(ddof=1), x2.std(ddof=1)
+
+    # Cohen's d (pooled SD)
     pooled_var = ((n1 - 1) * s1**2 + (n2 - 1) * s2**2) / (n1 + n2 - 2)
-    d = (x1.mean() - x2.mean()) / np.sqrt(pooled_var)
+    d = (m1 - m2) / np.sqrt(pooled_var)
 
     return {
         "dv": dv,
         "group1": g1,
         "group2": g2,
-        "mean1": x1.mean(),
-        "mean2": x2.mean(),
+        "mean1": m1,
+        "mean2": m2,
         "t": t,
         "p": p,
         "cohens_d": d,
         "n1": n1,
         "n2": n2,
-    }
\ No newline at end of file
+    }